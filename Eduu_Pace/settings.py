@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -82,6 +83,17 @@ DATABASES = {
 }
 
 
+# Authentication backends
+# Loads role profiles together with request.user (see edupace_app.backends).
+# ModelBackend stays listed so sessions created before ProfileModelBackend,
+# which store it as their backend, remain valid instead of logging users out
+
+AUTHENTICATION_BACKENDS = [
+    "edupace_app.backends.ProfileModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -100,6 +112,13 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# The test runner hashes every test user's password; PBKDF2 is deliberately
+# slow, so tests use a fast (insecure) hasher instead
+if sys.argv[1:2] == ["test"]:
+    PASSWORD_HASHERS = [
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+    ]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -17,6 +17,7 @@ class CourseAdmin(admin.ModelAdmin):
 @admin.register(Teacher)
 class TeacherAdmin(admin.ModelAdmin):
     list_display = ['user', 'employee_id', 'department', 'created_at']
+    list_select_related = ['user']
     search_fields = ['user__username', 'user__first_name', 'user__last_name', 'employee_id']
     filter_horizontal = ['courses']
     readonly_fields = ['created_at']
@@ -25,6 +26,7 @@ class TeacherAdmin(admin.ModelAdmin):
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
     list_display = ['user', 'student_id', 'program', 'enrollment_date', 'created_at']
+    list_select_related = ['user']
     search_fields = ['user__username', 'user__first_name', 'user__last_name', 'student_id']
     filter_horizontal = ['courses']
     readonly_fields = ['created_at']
@@ -33,6 +35,7 @@ class StudentAdmin(admin.ModelAdmin):
 @admin.register(AcademicBoard)
 class AcademicBoardAdmin(admin.ModelAdmin):
     list_display = ['user', 'employee_id', 'designation', 'created_at']
+    list_select_related = ['user']
     search_fields = ['user__username', 'user__first_name', 'user__last_name', 'employee_id']
     readonly_fields = ['created_at']
 
@@ -40,6 +43,7 @@ class AcademicBoardAdmin(admin.ModelAdmin):
 @admin.register(ProgramOutcome)
 class ProgramOutcomeAdmin(admin.ModelAdmin):
     list_display = ['code', 'academic_board', 'created_by', 'created_at']
+    list_select_related = ['academic_board__user', 'created_by']
     list_filter = ['academic_board', 'created_at']
     search_fields = ['code', 'description', 'academic_board__user__username']
     readonly_fields = ['created_at', 'updated_at']
@@ -48,6 +52,7 @@ class ProgramOutcomeAdmin(admin.ModelAdmin):
 @admin.register(LearningOutcome)
 class LearningOutcomeAdmin(admin.ModelAdmin):
     list_display = ['code', 'course', 'created_by', 'created_at']
+    list_select_related = ['course', 'created_by']
     list_filter = ['course', 'created_at']
     search_fields = ['code', 'description', 'course__code', 'course__name']
     readonly_fields = ['created_at', 'updated_at']
@@ -56,6 +61,7 @@ class LearningOutcomeAdmin(admin.ModelAdmin):
 @admin.register(Grade)
 class GradeAdmin(admin.ModelAdmin):
     list_display = ['student', 'course', 'grade', 'percentage', 'semester', 'academic_year', 'created_at']
+    list_select_related = ['student__user', 'course']
     list_filter = ['grade', 'course', 'semester', 'academic_year', 'created_at']
     search_fields = ['student__student_id', 'student__user__username', 'course__code', 'course__name']
     readonly_fields = ['created_at', 'updated_at']
@@ -64,6 +70,7 @@ class GradeAdmin(admin.ModelAdmin):
 @admin.register(Assessment)
 class AssessmentAdmin(admin.ModelAdmin):
     list_display = ['name', 'course', 'weight_in_course', 'created_at']
+    list_select_related = ['course']
     list_filter = ['course', 'created_at']
     search_fields = ['name', 'course__code', 'course__name']
     readonly_fields = ['created_at', 'updated_at']
@@ -72,6 +79,7 @@ class AssessmentAdmin(admin.ModelAdmin):
 @admin.register(AssessmentGrade)
 class AssessmentGradeAdmin(admin.ModelAdmin):
     list_display = ['student', 'assessment', 'grade', 'created_at']
+    list_select_related = ['student__user', 'assessment__course']
     list_filter = ['assessment__course', 'created_at']
     search_fields = ['student__student_id', 'student__user__username', 'assessment__name']
     readonly_fields = ['created_at', 'updated_at']
@@ -80,6 +88,7 @@ class AssessmentGradeAdmin(admin.ModelAdmin):
 @admin.register(AssessmentToLO)
 class AssessmentToLOAdmin(admin.ModelAdmin):
     list_display = ['assessment', 'learning_outcome', 'weight', 'created_at']
+    list_select_related = ['assessment__course', 'learning_outcome__course']
     list_filter = ['assessment__course', 'learning_outcome__course', 'created_at']
     search_fields = ['assessment__name', 'learning_outcome__code']
     readonly_fields = ['created_at', 'updated_at']
@@ -88,6 +97,7 @@ class AssessmentToLOAdmin(admin.ModelAdmin):
 @admin.register(LOToPO)
 class LOToPOAdmin(admin.ModelAdmin):
     list_display = ['learning_outcome', 'program_outcome', 'weight', 'created_at']
+    list_select_related = ['learning_outcome__course', 'program_outcome']
     list_filter = ['learning_outcome__course', 'program_outcome__academic_board', 'created_at']
     search_fields = ['learning_outcome__code', 'program_outcome__code']
     readonly_fields = ['created_at', 'updated_at']
@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend that loads the user's role profiles together with the user.
+    
+    get_user_role() checks the teacher, student and academic board profiles
+    on nearly every request; joining them here answers those checks from the
+    query that already loads request.user.
+    """
+    
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related(
+                'teacher_profile', 'student_profile', 'academic_board_profile'
+            ).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -1,22 +1,29 @@
 from .utils import get_user_role
 
 
+ROLE_DISPLAY_MAP = {
+    'student': 'Student',
+    'teacher': 'Teacher',
+    'academic_board': 'Department Head',
+}
+
+# Context for anonymous users; Django copies processor output into the
+# template context, so the same dict can be returned on every call
+_ANON_CTX = {
+    'user_role': None,
+    'user_role_display': None,
+}
+
+
 def user_role_context(request):
     """Add user role information to template context"""
     if request.user.is_authenticated:
-        role = get_user_role(request.user)
-        role_display_map = {
-            'student': 'Student',
-            'teacher': 'Teacher',
-            'academic_board': 'Department Head',
-        }
-        role_display = role_display_map.get(role, 'User')
+        # Resolve the role once per request, however many templates render
+        if not hasattr(request, '_cached_user_role'):
+            request._cached_user_role = get_user_role(request.user)
+        role = request._cached_user_role
         return {
             'user_role': role,
-            'user_role_display': role_display,
+            'user_role_display': ROLE_DISPLAY_MAP.get(role, 'User'),
         }
-    return {
-        'user_role': None,
-        'user_role_display': None,
-    }
-
+    return _ANON_CTX
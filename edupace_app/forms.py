@@ -2,20 +2,33 @@ from django import forms
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db.models import Q
 from .models import (
     Course, Teacher, Student, AcademicBoard,
     ProgramOutcome, LearningOutcome, Grade,
     Assessment, AssessmentGrade, AssessmentToLO, LOToPO
 )
+from .utils import read_excel_header, map_grade_columns
+
+
+# Largest grade spreadsheet accepted by GradeUploadForm
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+# Leading bytes of each accepted spreadsheet format: .xlsx files are ZIP
+# archives, legacy .xls files are OLE2 compound documents
+EXCEL_SIGNATURES = {
+    '.xlsx': b'PK\x03\x04',
+    '.xls': b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',
+}
 
 
 class RoleLoginForm(AuthenticationForm):
     """Login form with role selection"""
-    ROLE_CHOICES = [
+    ROLE_CHOICES = (
         ('student', 'Student'),
         ('teacher', 'Teacher'),
         ('academic_board', 'Department Head'),
-    ]
+    )
     
     role = forms.ChoiceField(
         choices=ROLE_CHOICES,
@@ -65,7 +78,7 @@ class ProgramOutcomeForm(forms.ModelForm):
 class LearningOutcomeForm(forms.ModelForm):
     """Form for creating/editing learning outcomes"""
     program_outcomes = forms.ModelMultipleChoiceField(
-        queryset=ProgramOutcome.objects.all(),
+        queryset=ProgramOutcome.objects.none(),
         widget=forms.SelectMultiple(attrs={'class': 'form-select'}),
         required=False,
         help_text="Select Program Outcomes to map this Learning Outcome to (optional)"
@@ -84,6 +97,7 @@ class LearningOutcomeForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # If course is provided, we can filter POs if needed in the future
         # For now, show all POs
+        self.fields['program_outcomes'].queryset = ProgramOutcome.objects.only('id', 'code')
 
 
 class GradeUploadForm(forms.Form):
@@ -128,7 +142,34 @@ class GradeUploadForm(forms.Form):
         teacher = kwargs.pop('teacher', None)
         super().__init__(*args, **kwargs)
         if teacher:
-            self.fields['course'].queryset = teacher.courses.all()
+            self.fields['course'].queryset = teacher.courses.only('id', 'code', 'name')
+    
+    def clean_excel_file(self):
+        excel_file = self.cleaned_data.get('excel_file')
+        if excel_file.size > MAX_UPLOAD_BYTES:
+            raise ValidationError(
+                f'File is too large. Maximum size is {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.'
+            )
+        
+        # Check the file signature so renamed or corrupt files are rejected
+        # before they reach the spreadsheet parser
+        extension = '.' + excel_file.name.rsplit('.', 1)[-1].lower()
+        signature = EXCEL_SIGNATURES.get(extension)
+        head = excel_file.read(len(signature)) if signature else b''
+        excel_file.seek(0)
+        if not signature or head != signature:
+            raise ValidationError('Please upload a valid Excel file (.xlsx or .xls).')
+        
+        # Only the header row is parsed here; the rows themselves are
+        # streamed by process_excel_grades once the form is valid
+        try:
+            header = read_excel_header(excel_file)
+        except Exception:
+            raise ValidationError('The Excel file could not be read.')
+        student_id_col, grade_col, _ = map_grade_columns(header)
+        if not student_id_col or not grade_col:
+            raise ValidationError("Excel file must contain 'Student ID' and 'Grade' columns.")
+        return excel_file
 
 
 class GradeForm(forms.ModelForm):
@@ -154,26 +195,72 @@ class GradeForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         teacher = kwargs.pop('teacher', None)
         super().__init__(*args, **kwargs)
+        # Student labels include the user's full name
+        self.fields['student'].queryset = self.fields['student'].queryset.select_related('user')
         if teacher:
-            self.fields['course'].queryset = teacher.courses.all()
+            self.fields['course'].queryset = teacher.courses.only('id', 'code', 'name')
 
 
 class AssignTeacherToCourseForm(forms.Form):
     """Form for assigning teachers to courses"""
     teacher = forms.ModelChoiceField(
-        queryset=Teacher.objects.all(),
+        queryset=Teacher.objects.none(),
         widget=forms.Select(attrs={'class': 'form-select'}),
         empty_label='Select a teacher'
     )
+    
+    def __init__(self, *args, **kwargs):
+        course = kwargs.pop('course', None)
+        super().__init__(*args, **kwargs)
+        teachers = Teacher.objects.select_related('user').only(
+            'id', 'employee_id', 'user__first_name', 'user__last_name'
+        )
+        if course:
+            # Teachers already assigned to the course are not offered again
+            teachers = teachers.exclude(courses=course)
+        self.fields['teacher'].queryset = teachers
 
 
 class EnrollStudentToCourseForm(forms.Form):
     """Form for enrolling students to courses"""
     student = forms.ModelChoiceField(
-        queryset=Student.objects.all(),
+        queryset=Student.objects.none(),
         widget=forms.Select(attrs={'class': 'form-select'}),
         empty_label='Select a student'
     )
+    
+    def __init__(self, *args, **kwargs):
+        course = kwargs.pop('course', None)
+        super().__init__(*args, **kwargs)
+        students = Student.objects.select_related('user').only(
+            'id', 'student_id', 'user__first_name', 'user__last_name'
+        )
+        if course:
+            # Students already enrolled in the course are not offered again
+            students = students.exclude(courses=course)
+        self.fields['student'].queryset = students
+
+
+def _taken_identifiers(username, profile_lookup, profile_id):
+    """
+    Check in a single query whether a username and a profile ID (e.g.
+    student_profile__student_id) are already in use.
+    
+    Returns (username_taken, profile_id_taken). Empty values are not looked up.
+    """
+    lookup = Q()
+    if username:
+        lookup |= Q(username=username)
+    if profile_id:
+        lookup |= Q(**{profile_lookup: profile_id})
+    
+    username_taken = profile_id_taken = False
+    for existing_username, existing_profile_id in User.objects.filter(lookup).values_list(
+        'username', profile_lookup
+    ):
+        username_taken = username_taken or (bool(username) and existing_username == username)
+        profile_id_taken = profile_id_taken or (bool(profile_id) and existing_profile_id == profile_id)
+    return username_taken, profile_id_taken
 
 
 class CreateStudentForm(forms.Form):
@@ -219,18 +306,6 @@ class CreateStudentForm(forms.Form):
         help_text='Program name (e.g., Computer Science)'
     )
     
-    def clean_username(self):
-        username = self.cleaned_data.get('username')
-        if User.objects.filter(username=username).exists():
-            raise ValidationError('A user with this username already exists.')
-        return username
-    
-    def clean_student_id(self):
-        student_id = self.cleaned_data.get('student_id')
-        if Student.objects.filter(student_id=student_id).exists():
-            raise ValidationError('A student with this student ID already exists.')
-        return student_id
-    
     def clean(self):
         cleaned_data = super().clean()
         password = cleaned_data.get('password')
@@ -243,6 +318,24 @@ class CreateStudentForm(forms.Form):
                 raise ValidationError("Password must be at least 8 characters long.")
         
         return cleaned_data
+    
+    def add_duplicate_errors(self):
+        """
+        Attach field errors for a username or student ID that is already in use.
+        Uniqueness is enforced by the database; the view calls this when
+        saving the student fails on one of those constraints.
+        """
+        username_taken, student_id_taken = _taken_identifiers(
+            self.cleaned_data.get('username'),
+            'student_profile__student_id',
+            self.cleaned_data.get('student_id')
+        )
+        if username_taken:
+            self.add_error('username', 'A user with this username already exists.')
+        if student_id_taken:
+            self.add_error('student_id', 'A student with this student ID already exists.')
+        if not (username_taken or student_id_taken):
+            self.add_error(None, 'The student could not be created. Please try again.')
 
 
 class CreateTeacherForm(forms.Form):
@@ -285,18 +378,6 @@ class CreateTeacherForm(forms.Form):
         help_text='Department name (e.g., Computer Science)'
     )
     
-    def clean_username(self):
-        username = self.cleaned_data.get('username')
-        if User.objects.filter(username=username).exists():
-            raise ValidationError('A user with this username already exists.')
-        return username
-    
-    def clean_employee_id(self):
-        employee_id = self.cleaned_data.get('employee_id')
-        if Teacher.objects.filter(employee_id=employee_id).exists():
-            raise ValidationError('A teacher with this employee ID already exists.')
-        return employee_id
-    
     def clean(self):
         cleaned_data = super().clean()
         password = cleaned_data.get('password')
@@ -309,6 +390,24 @@ class CreateTeacherForm(forms.Form):
                 raise ValidationError("Password must be at least 8 characters long.")
         
         return cleaned_data
+    
+    def add_duplicate_errors(self):
+        """
+        Attach field errors for a username or employee ID that is already in use.
+        Uniqueness is enforced by the database; the view calls this when
+        saving the teacher fails on one of those constraints.
+        """
+        username_taken, employee_id_taken = _taken_identifiers(
+            self.cleaned_data.get('username'),
+            'teacher_profile__employee_id',
+            self.cleaned_data.get('employee_id')
+        )
+        if username_taken:
+            self.add_error('username', 'A user with this username already exists.')
+        if employee_id_taken:
+            self.add_error('employee_id', 'A teacher with this employee ID already exists.')
+        if not (username_taken or employee_id_taken):
+            self.add_error(None, 'The teacher could not be created. Please try again.')
 
 
 class AssessmentForm(forms.ModelForm):
@@ -349,9 +448,13 @@ class AssessmentGradeForm(forms.ModelForm):
         course = kwargs.pop('course', None)
         super().__init__(*args, **kwargs)
         if course:
-            self.fields['assessment'].queryset = Assessment.objects.filter(course=course)
+            self.fields['assessment'].queryset = Assessment.objects.filter(
+                course=course
+            ).select_related('course').only('id', 'name', 'course__code')
             # Use reverse relation to get students enrolled in the course
-            self.fields['student'].queryset = course.students.all()
+            self.fields['student'].queryset = course.students.select_related('user').only(
+                'id', 'student_id', 'user__first_name', 'user__last_name'
+            )
 
 
 class AssessmentToLOForm(forms.ModelForm):
@@ -374,8 +477,12 @@ class AssessmentToLOForm(forms.ModelForm):
         course = kwargs.pop('course', None)
         super().__init__(*args, **kwargs)
         if course:
-            self.fields['assessment'].queryset = Assessment.objects.filter(course=course)
-            self.fields['learning_outcome'].queryset = LearningOutcome.objects.filter(course=course)
+            self.fields['assessment'].queryset = Assessment.objects.filter(
+                course=course
+            ).select_related('course').only('id', 'name', 'course__code')
+            self.fields['learning_outcome'].queryset = LearningOutcome.objects.filter(
+                course=course
+            ).select_related('course').only('id', 'code', 'course__code')
 
 
 class LOToPOForm(forms.ModelForm):
@@ -399,7 +506,11 @@ class LOToPOForm(forms.ModelForm):
         academic_board = kwargs.pop('academic_board', None)
         super().__init__(*args, **kwargs)
         if course:
-            self.fields['learning_outcome'].queryset = LearningOutcome.objects.filter(course=course)
+            self.fields['learning_outcome'].queryset = LearningOutcome.objects.filter(
+                course=course
+            ).select_related('course').only('id', 'code', 'course__code')
         if academic_board:
-            self.fields['program_outcome'].queryset = ProgramOutcome.objects.filter(academic_board=academic_board)
+            self.fields['program_outcome'].queryset = ProgramOutcome.objects.filter(
+                academic_board=academic_board
+            ).only('id', 'code')
 
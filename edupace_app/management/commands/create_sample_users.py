@@ -1,11 +1,14 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.db import transaction
 from edupace_app.models import Student, Teacher, AcademicBoard
 
 
 class Command(BaseCommand):
     help = 'Creates sample users for testing (Student, Teacher, and Academic Board)'
 
+    # All users and profiles are written in one transaction (a single commit)
+    @transaction.atomic
     def handle(self, *args, **options):
         # Create Academic Board user
         if not User.objects.filter(username='board1').exists():
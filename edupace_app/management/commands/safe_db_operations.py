@@ -22,10 +22,57 @@ Example Operations:
     - Create learning/program outcomes
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand
 from django.db import connection, transaction
 from django.utils import timezone
 from datetime import date
+from edupace_app.models import Course, LearningOutcome
+
+
+# Students created by the insert_student example; rows may carry an optional
+# 'password' key, otherwise the account gets an unusable password
+EXAMPLE_STUDENTS = [
+    {
+        'username': 'ahmet.student',
+        'email': 'ahmet@example.com',
+        'first_name': 'Ahmet',
+        'last_name': 'Yılmaz',
+        'student_id': 'STU2024001',
+        'program': 'Computer Science',
+    },
+]
+
+# (course_id, assessment name, student_id, grade) rows for the
+# add_assessment_grade example
+EXAMPLE_ASSESSMENT_GRADES = [
+    (1, 'Midterm', 'STU2024001', 85.5),
+]
+
+# (course_id, code, description) rows for the bulk_operations_orm example
+EXAMPLE_LEARNING_OUTCOMES = [
+    (1, 'LO1', 'Understand fundamental concepts'),
+]
+
+
+def batched(rows, size):
+    """Yield successive lists of at most size rows"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def hash_passwords(passwords):
+    """
+    Hash a list of raw passwords concurrently.
+    
+    PBKDF2 runs in hashlib with the GIL released, so a thread pool spreads
+    the hashing of a bulk import over all CPU cores.
+    """
+    with ThreadPoolExecutor() as executor:
+        return list(executor.map(make_password, passwords))
 
 
 class Command(BaseCommand):
@@ -46,15 +93,23 @@ class Command(BaseCommand):
                 'create_enrollment',
                 'add_assessment_grade',
                 'bulk_operations',
+                'bulk_operations_orm',
                 'all'
             ],
             default='all',
             help='Specific operation to perform (default: all)',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per multi-row INSERT in the bulk examples (default: 1000)',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         operation = options['operation']
+        batch_size = options['batch_size']
         
         if dry_run:
             self.stdout.write(
@@ -63,7 +118,7 @@ class Command(BaseCommand):
         
         try:
             if operation == 'all' or operation == 'insert_student':
-                self.insert_student_example(dry_run)
+                self.insert_student_example(dry_run, batch_size)
             
             if operation == 'all' or operation == 'update_course':
                 self.update_course_example(dry_run)
@@ -72,11 +127,14 @@ class Command(BaseCommand):
                 self.create_enrollment_example(dry_run)
             
             if operation == 'all' or operation == 'add_assessment_grade':
-                self.add_assessment_grade_example(dry_run)
+                self.add_assessment_grade_example(dry_run, batch_size)
             
             if operation == 'all' or operation == 'bulk_operations':
                 self.bulk_operations_example(dry_run)
             
+            if operation == 'bulk_operations_orm':
+                self.bulk_operations_orm(dry_run, batch_size)
+            
             if not dry_run:
                 self.stdout.write(
                     self.style.SUCCESS('✅ All operations completed successfully!')
@@ -95,8 +153,8 @@ class Command(BaseCommand):
             )
             raise
 
-    def insert_student_example(self, dry_run):
-        """Example: Insert a new student with User account"""
+    def insert_student_example(self, dry_run, batch_size):
+        """Example: Insert new students with User accounts, in batches"""
         self.stdout.write('\n📝 Example: Insert Student')
         
         if dry_run:
@@ -105,47 +163,65 @@ class Command(BaseCommand):
         
         # Begin transaction
         with transaction.atomic():
+            now = timezone.now()
             with connection.cursor() as cursor:
-                # First, create the User account
-                cursor.execute(
-                    """
-                    INSERT INTO auth_user (username, email, first_name, last_name, 
-                                         password, is_staff, is_active, date_joined)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                    """,
-                    [
-                        'ahmet.student',
-                        'ahmet@example.com',
-                        'Ahmet',
-                        'Yılmaz',
-                        'pbkdf2_sha256$dummy',  # Note: Use proper password hashing in production
-                        False,
-                        True,
-                        timezone.now()
-                    ]
-                )
-                user_id = cursor.fetchone()[0]
-                
-                # Then, create the Student profile
-                cursor.execute(
-                    """
-                    INSERT INTO edupace_app_student (user_id, student_id, enrollment_date, 
-                                                     program, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                    """,
-                    [
-                        user_id,
-                        'STU2024001',
-                        date.today(),
-                        'Computer Science',
-                        timezone.now()
-                    ]
-                )
-                
-                self.stdout.write(
-                    self.style.SUCCESS(f'  ✅ Created student: Ahmet Yılmaz (STU2024001)')
-                )
+                for students in batched(EXAMPLE_STUDENTS, batch_size):
+                    # Rows without a password get an unusable one, so the
+                    # example never creates a known login
+                    passwords = hash_passwords([student.get('password') for student in students])
+                    
+                    # First, create the User accounts
+                    cursor.executemany(
+                        """
+                        INSERT INTO auth_user (username, email, first_name, last_name, 
+                                             password, is_superuser, is_staff, is_active,
+                                             date_joined)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        """,
+                        [
+                            [
+                                student['username'],
+                                student['email'],
+                                student['first_name'],
+                                student['last_name'],
+                                password,
+                                False,
+                                False,
+                                True,
+                                now
+                            ]
+                            for student, password in zip(students, passwords)
+                        ]
+                    )
+                    
+                    # Then, create the Student profiles; each row takes its
+                    # user_id from the account just inserted, so the new ids
+                    # never travel back to Python
+                    cursor.executemany(
+                        """
+                        INSERT INTO edupace_app_student (user_id, student_id, enrollment_date, 
+                                                         program, created_at)
+                        SELECT id, %s, %s, %s, %s FROM auth_user WHERE username = %s
+                        """,
+                        [
+                            [
+                                student['student_id'],
+                                date.today(),
+                                student['program'],
+                                now,
+                                student['username']
+                            ]
+                            for student in students
+                        ]
+                    )
+                    
+                    for student in students:
+                        self.stdout.write(
+                            self.style.SUCCESS(
+                                f"  ✅ Created student: {student['first_name']} {student['last_name']} "
+                                f"({student['student_id']})"
+                            )
+                        )
 
     def update_course_example(self, dry_run):
         """Example: Update course information safely"""
@@ -209,36 +285,29 @@ class Command(BaseCommand):
                     )
                     return
                 
-                # Check if enrollment already exists
+                # Create enrollment; the unique (student_id, course_id) pair
+                # turns an existing enrollment into a no-op
                 cursor.execute(
                     """
-                    SELECT id FROM edupace_app_student_courses 
-                    WHERE student_id = %s AND course_id = %s
+                    INSERT INTO edupace_app_student_courses (student_id, course_id)
+                    VALUES (%s, %s)
+                    ON CONFLICT (student_id, course_id) DO NOTHING
                     """,
                     [student[0], course[0]]
                 )
                 
-                if cursor.fetchone():
+                if cursor.rowcount == 0:
                     self.stdout.write(
                         self.style.WARNING('  ⚠️  Enrollment already exists, skipping')
                     )
                     return
                 
-                # Create enrollment
-                cursor.execute(
-                    """
-                    INSERT INTO edupace_app_student_courses (student_id, course_id)
-                    VALUES (%s, %s)
-                    """,
-                    [student[0], course[0]]
-                )
-                
                 self.stdout.write(
                     self.style.SUCCESS('  ✅ Created enrollment')
                 )
 
-    def add_assessment_grade_example(self, dry_run):
-        """Example: Add assessment grade for a student"""
+    def add_assessment_grade_example(self, dry_run, batch_size):
+        """Example: Add assessment grades for students, in batches"""
         self.stdout.write('\n📝 Example: Add Assessment Grade')
         
         if dry_run:
@@ -246,56 +315,65 @@ class Command(BaseCommand):
             return
         
         with transaction.atomic():
+            now = timezone.now()
             with connection.cursor() as cursor:
-                # Get assessment and student IDs
+                # Resolve assessment and student IDs with one query each
+                course_ids = sorted({row[0] for row in EXAMPLE_ASSESSMENT_GRADES})
                 cursor.execute(
                     """
-                    SELECT id FROM edupace_app_assessment 
-                    WHERE course_id = %s AND name = %s
-                    """,
-                    [1, 'Midterm']
+                    SELECT course_id, name, id FROM edupace_app_assessment 
+                    WHERE course_id IN (%s)
+                    """ % ', '.join(['%s'] * len(course_ids)),
+                    course_ids
                 )
-                assessment = cursor.fetchone()
+                assessment_map = {
+                    (course_id, name): pk for course_id, name, pk in cursor.fetchall()
+                }
                 
+                student_ids = sorted({row[2] for row in EXAMPLE_ASSESSMENT_GRADES})
                 cursor.execute(
-                    "SELECT id FROM edupace_app_student WHERE student_id = %s",
-                    ['STU2024001']
+                    "SELECT student_id, id FROM edupace_app_student WHERE student_id IN (%s)"
+                    % ', '.join(['%s'] * len(student_ids)),
+                    student_ids
                 )
-                student = cursor.fetchone()
+                student_map = dict(cursor.fetchall())
                 
-                if not assessment or not student:
-                    self.stdout.write(
-                        self.style.WARNING('  ⚠️  Assessment or student not found, skipping')
+                new_grades = []
+                for course_id, assessment_name, student_id, grade in EXAMPLE_ASSESSMENT_GRADES:
+                    assessment_pk = assessment_map.get((course_id, assessment_name))
+                    student_pk = student_map.get(student_id)
+                    
+                    if assessment_pk is None or student_pk is None:
+                        self.stdout.write(
+                            self.style.WARNING('  ⚠️  Assessment or student not found, skipping')
+                        )
+                        continue
+                    
+                    new_grades.append(
+                        [assessment_pk, student_pk, grade, now, now]
                     )
-                    return
                 
-                # Check if grade already exists
-                cursor.execute(
-                    """
-                    SELECT id FROM edupace_app_assessmentgrade 
-                    WHERE assessment_id = %s AND student_id = %s
-                    """,
-                    [assessment[0], student[0]]
-                )
+                # Insert assessment grades, leaving existing ones untouched
+                created_count = 0
+                for grades in batched(new_grades, batch_size):
+                    cursor.executemany(
+                        """
+                        INSERT INTO edupace_app_assessmentgrade 
+                        (assessment_id, student_id, grade, created_at, updated_at)
+                        VALUES (%s, %s, %s, %s, %s)
+                        ON CONFLICT (assessment_id, student_id) DO NOTHING
+                        """,
+                        grades
+                    )
+                    created_count += cursor.rowcount
                 
-                if cursor.fetchone():
+                skipped_count = len(new_grades) - created_count
+                if skipped_count:
                     self.stdout.write(
-                        self.style.WARNING('  ⚠️  Grade already exists, skipping')
+                        self.style.WARNING(f'  ⚠️  {skipped_count} grade(s) already exist, skipping')
                     )
-                    return
-                
-                # Insert assessment grade
-                cursor.execute(
-                    """
-                    INSERT INTO edupace_app_assessmentgrade 
-                    (assessment_id, student_id, grade, created_at, updated_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                    """,
-                    [assessment[0], student[0], 85.5, timezone.now(), timezone.now()]
-                )
-                
                 self.stdout.write(
-                    self.style.SUCCESS('  ✅ Added assessment grade: 85.5')
+                    self.style.SUCCESS(f'  ✅ Added {created_count} assessment grade(s)')
                 )
 
     def bulk_operations_example(self, dry_run):
@@ -307,6 +385,7 @@ class Command(BaseCommand):
             return
         
         with transaction.atomic():
+            now = timezone.now()
             with connection.cursor() as cursor:
                 # Operation 1: Update multiple course descriptions
                 cursor.execute(
@@ -315,58 +394,103 @@ class Command(BaseCommand):
                     SET description = %s, updated_at = %s 
                     WHERE code LIKE %s
                     """,
-                    ['Updated course description', timezone.now(), 'CS%']
+                    ['Updated course description', now, 'CS%']
                 )
                 updated_count = cursor.rowcount
                 
-                # Operation 2: Insert learning outcome if it doesn't exist
+                # Operation 2: Insert learning outcome if it doesn't exist,
+                # with created_by taken from the first staff user (or NULL)
                 cursor.execute(
                     """
-                    SELECT id FROM edupace_app_learningoutcome 
-                    WHERE course_id = %s AND code = %s
+                    INSERT INTO edupace_app_learningoutcome 
+                    (course_id, code, description, created_by_id, created_at, updated_at)
+                    VALUES (
+                        %s, %s, %s,
+                        (SELECT id FROM auth_user WHERE is_staff = %s LIMIT 1),
+                        %s, %s
+                    )
+                    ON CONFLICT (course_id, code) DO NOTHING
                     """,
-                    [1, 'LO1']
+                    [
+                        1,
+                        'LO1',
+                        'Understand fundamental concepts',
+                        True,
+                        now,
+                        now
+                    ]
                 )
-                
-                if not cursor.fetchone():
-                    # Get a user ID for created_by (use first teacher or admin)
-                    cursor.execute(
-                        "SELECT id FROM auth_user WHERE is_staff = %s LIMIT 1",
-                        [True]
-                    )
-                    user = cursor.fetchone()
-                    created_by_id = user[0] if user else None
-                    
-                    cursor.execute(
-                        """
-                        INSERT INTO edupace_app_learningoutcome 
-                        (course_id, code, description, created_by_id, created_at, updated_at)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        """,
-                        [
-                            1,
-                            'LO1',
-                            'Understand fundamental concepts',
-                            created_by_id,
-                            timezone.now(),
-                            timezone.now()
-                        ]
-                    )
+                if cursor.rowcount:
                     self.stdout.write('  ✅ Created learning outcome: LO1')
+                else:
+                    self.stdout.write('  ⚠️  Learning outcome LO1 already exists, skipping')
                 
                 self.stdout.write(
                     self.style.SUCCESS(f'  ✅ Updated {updated_count} course(s)')
                 )
 
+    def bulk_operations_orm(self, dry_run, batch_size):
+        """
+        Example: The bulk operations example written with the ORM.
+        
+        The course update is a single UPDATE statement and the learning
+        outcomes are written with multi-row INSERTs sized to the database's
+        parameter limit; rows that already exist are skipped. Neither
+        queryset.update() nor bulk_create() calls save() or sends
+        pre_save/post_save signals, and with ignore_conflicts=True the
+        created objects do not get their primary keys set.
+        """
+        self.stdout.write('\n📝 Example: Bulk Operations (ORM)')
+        
+        if dry_run:
+            self.stdout.write('  Would execute: Course UPDATE + LearningOutcome bulk_create')
+            return
+        
+        with transaction.atomic():
+            now = timezone.now()
+            updated_count = Course.objects.filter(code__startswith='CS').update(
+                description='Updated course description',
+                updated_at=now
+            )
+            
+            created_by_id = User.objects.filter(is_staff=True).values_list('id', flat=True).first()
+            LearningOutcome.objects.bulk_create(
+                [
+                    LearningOutcome(
+                        course_id=course_id,
+                        code=code,
+                        description=description,
+                        created_by_id=created_by_id
+                    )
+                    for course_id, code, description in EXAMPLE_LEARNING_OUTCOMES
+                ],
+                batch_size=batch_size,
+                ignore_conflicts=True
+            )
+            
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'  ✅ Bulk-created learning outcomes from {len(EXAMPLE_LEARNING_OUTCOMES)} '
+                    f'row(s), existing ones skipped'
+                )
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f'  ✅ Updated {updated_count} course(s)')
+            )
+
 
 # ============================================================================
 # STANDALONE SCRIPT VERSION (for use outside management commands)
 # ============================================================================
 
-def run_safe_operations():
+def run_safe_operations(students=None, course_id=1, batch_size=1000):
     """
     Standalone function that can be imported and used in other scripts.
     
+    students is a list of dicts with username, email, first_name, last_name,
+    student_id and program keys; each student is created and enrolled in
+    course_id. Rows are written batch_size at a time with executemany.
+    
     Usage:
         from edupace_app.management.commands.safe_db_operations import run_safe_operations
         run_safe_operations()
@@ -375,65 +499,82 @@ def run_safe_operations():
     from django.utils import timezone
     from datetime import date
     
+    if students is None:
+        students = [
+            {
+                'username': 'new.student',
+                'email': 'new@example.com',
+                'first_name': 'New',
+                'last_name': 'Student',
+                'student_id': 'STU2024002',
+                'program': 'Computer Science',
+            },
+        ]
+    
     try:
         with transaction.atomic():
+            now = timezone.now()
+            today = date.today()
             with connection.cursor() as cursor:
-                # ✅ Example: Insert a new student
-                cursor.execute(
-                    """
-                    INSERT INTO auth_user (username, email, first_name, last_name, 
-                                         password, is_staff, is_active, date_joined)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                    """,
-                    [
-                        'new.student',
-                        'new@example.com',
-                        'New',
-                        'Student',
-                        'pbkdf2_sha256$dummy',  # Use proper password hashing
-                        False,
-                        True,
-                        timezone.now()
-                    ]
-                )
-                user_id = cursor.fetchone()[0]
-                
-                cursor.execute(
-                    """
-                    INSERT INTO edupace_app_student (user_id, student_id, enrollment_date, 
-                                                     program, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                    """,
-                    [
-                        user_id,
-                        'STU2024002',
-                        date.today(),
-                        'Computer Science',
-                        timezone.now()
-                    ]
-                )
+                for batch in batched(students, batch_size):
+                    # ✅ Example: Insert new students
+                    cursor.executemany(
+                        """
+                        INSERT INTO auth_user (username, email, first_name, last_name, 
+                                             password, is_superuser, is_staff, is_active,
+                                             date_joined)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        """,
+                        [
+                            [
+                                student['username'],
+                                student['email'],
+                                student['first_name'],
+                                student['last_name'],
+                                'pbkdf2_sha256$dummy',  # Use proper password hashing
+                                False,
+                                False,
+                                True,
+                                now
+                            ]
+                            for student in batch
+                        ]
+                    )
+                    
+                    cursor.executemany(
+                        """
+                        INSERT INTO edupace_app_student (user_id, student_id, enrollment_date, 
+                                                         program, created_at)
+                        SELECT id, %s, %s, %s, %s FROM auth_user WHERE username = %s
+                        """,
+                        [
+                            [
+                                student['student_id'],
+                                today,
+                                student['program'],
+                                now,
+                                student['username']
+                            ]
+                            for student in batch
+                        ]
+                    )
                 
                 # ✅ Example: Update a course title
                 cursor.execute(
                     "UPDATE edupace_app_course SET name = %s, updated_at = %s WHERE id = %s",
-                    ['Updated Course Name', timezone.now(), 1]
+                    ['Updated Course Name', now, 1]
                 )
                 
-                # ✅ Example: Create enrollment
-                cursor.execute(
-                    """
-                    INSERT INTO edupace_app_student_courses (student_id, course_id)
-                    SELECT s.id, c.id
-                    FROM edupace_app_student s, edupace_app_course c
-                    WHERE s.student_id = %s AND c.id = %s
-                    AND NOT EXISTS (
-                        SELECT 1 FROM edupace_app_student_courses sc
-                        WHERE sc.student_id = s.id AND sc.course_id = c.id
+                # ✅ Example: Create enrollments
+                for batch in batched(students, batch_size):
+                    cursor.executemany(
+                        """
+                        INSERT INTO edupace_app_student_courses (student_id, course_id)
+                        SELECT id, %s FROM edupace_app_student WHERE student_id = %s
+                        ON CONFLICT (student_id, course_id) DO NOTHING
+                        """,
+                        [[course_id, student['student_id']] for student in batch]
                     )
-                    """,
-                    ['STU2024002', 1]
-                )
         
         print("✅ All operations completed successfully!")
         
@@ -32,48 +32,50 @@ class Command(BaseCommand):
             )
         
         try:
-            # Count locked courses before
-            locked_count = Course.objects.filter(is_locked=True).count()
-            
-            if locked_count == 0:
-                self.stdout.write(
-                    self.style.SUCCESS('✅ No locked courses found. All courses are already unlocked.')
-                )
-                return
-            
+            # Only a dry run needs to look up locked courses up front
             if dry_run:
+                # No ordering, so the lookup can use the partial
+                # course_locked_idx index
+                locked_courses = list(
+                    Course.objects.filter(is_locked=True).order_by().values_list('id', 'code')
+                )
+                if not locked_courses:
+                    self.stdout.write(
+                        self.style.SUCCESS('✅ No locked courses found. All courses are already unlocked.')
+                    )
+                    return
+                
                 self.stdout.write(
-                    self.style.WARNING(f'Would unlock {locked_count} course(s)')
+                    self.style.WARNING(f'Would unlock {len(locked_courses)} course(s):')
                 )
+                self.write_courses(locked_courses)
                 return
             
-            # Unlock all courses using a safe transaction
+            # Unlock all courses using a safe transaction; the UPDATE returns
+            # the courses that were locked. The WHERE clause matches the
+            # predicate of the partial course_locked_idx index exactly, so
+            # SQLite uses the index instead of scanning the table
             with transaction.atomic():
                 with connection.cursor() as cursor:
                     cursor.execute(
-                        "UPDATE edupace_app_course SET is_locked = %s WHERE is_locked = %s",
-                        [False, True]
+                        "UPDATE edupace_app_course SET is_locked = %s WHERE is_locked "
+                        "RETURNING id, code",
+                        [False]
                     )
-                    updated_count = cursor.rowcount
+                    unlocked_courses = cursor.fetchall()
+            
+            if not unlocked_courses:
+                self.stdout.write(
+                    self.style.SUCCESS('✅ No locked courses found. All courses are already unlocked.')
+                )
+                return
             
             self.stdout.write(
                 self.style.SUCCESS(
-                    f'✅ Successfully unlocked {updated_count} course(s)'
+                    f'✅ Successfully unlocked {len(unlocked_courses)} course(s):'
                 )
             )
-            
-            # Verify
-            remaining_locked = Course.objects.filter(is_locked=True).count()
-            if remaining_locked == 0:
-                self.stdout.write(
-                    self.style.SUCCESS('✅ Verification: All courses are now unlocked.')
-                )
-            else:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f'⚠️  Warning: {remaining_locked} course(s) are still locked.'
-                    )
-                )
+            self.write_courses(unlocked_courses)
         
         except Exception as e:
             self.stdout.write(
@@ -84,3 +86,8 @@ class Command(BaseCommand):
             )
             raise
 
+    def write_courses(self, courses):
+        """Write one line per (id, code) pair, ordered by id"""
+        for course_id, code in sorted(courses):
+            self.stdout.write(f'  - {code} (id={course_id})')
+
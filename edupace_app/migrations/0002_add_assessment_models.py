@@ -6,17 +6,6 @@ from django.conf import settings
 from django.db import migrations, models
 
 
-def delete_existing_program_outcomes(apps, schema_editor):
-    """Delete existing ProgramOutcome records since they're linked to course instead of academic_board"""
-    ProgramOutcome = apps.get_model('edupace_app', 'ProgramOutcome')
-    ProgramOutcome.objects.all().delete()
-
-
-def reverse_delete_program_outcomes(apps, schema_editor):
-    """Reverse migration - nothing to do"""
-    pass
-
-
 class Migration(migrations.Migration):
     dependencies = [
         ("edupace_app", "0001_initial"),
@@ -24,8 +13,13 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        # Delete existing ProgramOutcome records before changing the model structure
-        migrations.RunPython(delete_existing_program_outcomes, reverse_delete_program_outcomes),
+        # Delete existing ProgramOutcome records before changing the model structure,
+        # since they're linked to course instead of academic_board. Nothing references
+        # ProgramOutcome yet, so a single DELETE empties the table.
+        migrations.RunSQL(
+            sql="DELETE FROM edupace_app_programoutcome",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
         # First, add academic_board field to ProgramOutcome (nullable temporarily)
         migrations.AddField(
             model_name="programoutcome",
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("edupace_app", "0003_add_assessment_type_to_grade"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                condition=models.Q(("is_locked", True)),
+                fields=["is_locked"],
+                name="course_locked_idx",
+            ),
+        ),
+    ]
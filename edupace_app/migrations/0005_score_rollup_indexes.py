@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("edupace_app", "0004_course_locked_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="assessmentgrade",
+            index=models.Index(
+                fields=["assessment", "student", "grade"], name="ag_covering_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="assessmenttolo",
+            index=models.Index(
+                fields=["learning_outcome", "assessment", "weight"],
+                name="a2lo_covering_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lotopo",
+            index=models.Index(
+                fields=["program_outcome", "learning_outcome", "weight"],
+                name="lo2po_covering_idx",
+            ),
+        ),
+    ]
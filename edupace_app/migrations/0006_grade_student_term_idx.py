@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("edupace_app", "0005_score_rollup_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="grade",
+            index=models.Index(
+                fields=[
+                    "student",
+                    "-academic_year",
+                    "-semester",
+                    "course",
+                    "assessment_type",
+                ],
+                name="grade_student_term_idx",
+            ),
+        ),
+    ]
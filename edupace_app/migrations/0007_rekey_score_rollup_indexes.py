@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("edupace_app", "0006_grade_student_term_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="assessmentgrade",
+            name="ag_covering_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="assessmenttolo",
+            name="a2lo_covering_idx",
+        ),
+        migrations.AddIndex(
+            model_name="assessmentgrade",
+            index=models.Index(
+                fields=["student", "assessment", "grade"],
+                name="ag_student_covering_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="assessmenttolo",
+            index=models.Index(
+                fields=["assessment", "learning_outcome", "weight"],
+                name="a2lo_assessment_covering_idx",
+            ),
+        ),
+    ]
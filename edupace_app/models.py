@@ -20,9 +20,42 @@ class Course(models.Model):
         ordering = ['code']
         verbose_name = "Course"
         verbose_name_plural = "Courses"
+        indexes = [
+            # Partial index: only locked courses are ever looked up by is_locked
+            models.Index(fields=['is_locked'], name='course_locked_idx', condition=models.Q(is_locked=True)),
+        ]
     
     def __str__(self):
         return f"{self.code} - {self.name}"
+    
+    @classmethod
+    def load_obe_tree(cls, course_ids):
+        """
+        Load courses with their whole outcome graph prefetched: assessments,
+        their grades (with students), their LO connections (with learning
+        outcomes) and those learning outcomes' PO connections (with program
+        outcomes). Walking the tree afterwards runs no further queries.
+        """
+        return cls.objects.filter(id__in=course_ids).prefetch_related(
+            models.Prefetch(
+                'assessments',
+                queryset=Assessment.objects.prefetch_related(
+                    models.Prefetch(
+                        'grades',
+                        queryset=AssessmentGrade.objects.select_related('student__user')
+                    ),
+                    models.Prefetch(
+                        'lo_connections',
+                        queryset=AssessmentToLO.objects.select_related('learning_outcome').prefetch_related(
+                            models.Prefetch(
+                                'learning_outcome__po_connections',
+                                queryset=LOToPO.objects.select_related('program_outcome')
+                            )
+                        )
+                    ),
+                )
+            )
+        )
 
 
 class Teacher(models.Model):
@@ -162,6 +195,13 @@ class Grade(models.Model):
         ordering = ['-academic_year', '-semester', 'course', 'assessment_type']
         verbose_name = "Grade"
         verbose_name_plural = "Grades"
+        indexes = [
+            # A student's grades by term, in the default ordering (transcripts, dashboard)
+            models.Index(
+                fields=['student', '-academic_year', '-semester', 'course', 'assessment_type'],
+                name='grade_student_term_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.student.student_id} - {self.course.code} - {self.get_assessment_type_display()} - {self.grade}"
@@ -204,9 +244,31 @@ class AssessmentGrade(models.Model):
         ordering = ['assessment', 'student']
         verbose_name = "Assessment Grade"
         verbose_name_plural = "Assessment Grades"
+        indexes = [
+            # Covers the student's grades read by LO/PO score rollups (index-only scans)
+            models.Index(fields=['student', 'assessment', 'grade'], name='ag_student_covering_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student.student_id} - {self.assessment.name}: {self.grade}"
+    
+    @classmethod
+    def bulk_upsert(cls, rows, batch_size=1000):
+        """
+        Create or update many assessment grades at once. rows is an iterable
+        of dicts of field values (assessment/assessment_id, student/student_id,
+        grade); an existing grade for the same assessment and student is
+        overwritten. Rows are written with multi-row INSERT ... ON CONFLICT
+        statements of batch_size rows, so field validators, save() and model
+        signals are not run.
+        """
+        return cls.objects.bulk_create(
+            [cls(**row) for row in rows],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['assessment', 'student'],
+            update_fields=['grade', 'updated_at'],
+        )
 
 
 class AssessmentToLO(models.Model):
@@ -225,6 +287,10 @@ class AssessmentToLO(models.Model):
         ordering = ['assessment', 'learning_outcome']
         verbose_name = "Assessment to Learning Outcome"
         verbose_name_plural = "Assessment to Learning Outcomes"
+        indexes = [
+            # Covers the edges read per graded assessment when computing LO scores
+            models.Index(fields=['assessment', 'learning_outcome', 'weight'], name='a2lo_assessment_covering_idx'),
+        ]
     
     def __str__(self):
         return f"{self.assessment.name} → {self.learning_outcome.code} ({self.weight})"
@@ -246,6 +312,10 @@ class LOToPO(models.Model):
         ordering = ['learning_outcome', 'program_outcome']
         verbose_name = "Learning Outcome to Program Outcome"
         verbose_name_plural = "Learning Outcome to Program Outcomes"
+        indexes = [
+            # Covers the edges read per program outcome when computing PO scores
+            models.Index(fields=['program_outcome', 'learning_outcome', 'weight'], name='lo2po_covering_idx'),
+        ]
     
     def __str__(self):
         return f"{self.learning_outcome.code} → {self.program_outcome.code} ({self.weight})"
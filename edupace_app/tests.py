@@ -1,3 +1,121 @@
+from datetime import date
+
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from .models import (
+    AcademicBoard, Assessment, AssessmentGrade, AssessmentToLO, Course,
+    LearningOutcome, LOToPO, ProgramOutcome, Student
+)
+from .utils import calculate_outcome_scores
+
+
+def reference_lo_score(student, learning_outcome):
+    """LO_score = Σ(AssessmentGrade × weight) / Σ(weights), one edge at a time"""
+    total_weighted_score = 0.0
+    total_weight = 0.0
+    for connection in AssessmentToLO.objects.filter(learning_outcome=learning_outcome):
+        grade = AssessmentGrade.objects.filter(
+            assessment=connection.assessment, student=student
+        ).first()
+        if grade is not None:
+            total_weighted_score += grade.grade * connection.weight
+            total_weight += connection.weight
+    return total_weighted_score / total_weight if total_weight else None
+
+
+def reference_po_score(student, program_outcome):
+    """PO_score = Σ(LO_score × weight) / Σ(weights), one edge at a time"""
+    total_weighted_score = 0.0
+    total_weight = 0.0
+    for connection in LOToPO.objects.filter(program_outcome=program_outcome):
+        lo_score = reference_lo_score(student, connection.learning_outcome)
+        if lo_score is not None:
+            total_weighted_score += lo_score * connection.weight
+            total_weight += connection.weight
+    return total_weighted_score / total_weight if total_weight else None
+
+
+class CalculateOutcomeScoresTests(TestCase):
+    """calculate_outcome_scores against the per-edge LO/PO formulas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        board_user = User.objects.create_user(username='board', password='board123')
+        board = AcademicBoard.objects.create(user=board_user, employee_id='AB1')
+        cls.po1 = ProgramOutcome.objects.create(academic_board=board, code='PO1', description='PO1')
+        cls.po2 = ProgramOutcome.objects.create(academic_board=board, code='PO2', description='PO2')
+
+        cls.course = Course.objects.create(code='CS101', name='Intro', credits=3)
+        other_course = Course.objects.create(code='CS102', name='Next', credits=3)
+        midterm = Assessment.objects.create(course=cls.course, name='Midterm', weight_in_course=0.4)
+        final = Assessment.objects.create(course=cls.course, name='Final', weight_in_course=0.6)
+        project = Assessment.objects.create(course=other_course, name='Project', weight_in_course=1.0)
+
+        cls.lo1 = LearningOutcome.objects.create(course=cls.course, code='LO1', description='LO1')
+        cls.lo2 = LearningOutcome.objects.create(course=cls.course, code='LO2', description='LO2')
+        cls.lo3 = LearningOutcome.objects.create(course=cls.course, code='LO3', description='LO3')
+        cls.other_lo = LearningOutcome.objects.create(course=other_course, code='LO1', description='LO1')
+
+        AssessmentToLO.objects.create(assessment=midterm, learning_outcome=cls.lo1, weight=0.4)
+        AssessmentToLO.objects.create(assessment=final, learning_outcome=cls.lo1, weight=0.6)
+        AssessmentToLO.objects.create(assessment=final, learning_outcome=cls.lo2, weight=1.0)
+        AssessmentToLO.objects.create(assessment=project, learning_outcome=cls.other_lo, weight=1.0)
+
+        # PO1 also draws on a learning outcome of another course
+        LOToPO.objects.create(learning_outcome=cls.lo1, program_outcome=cls.po1, weight=0.5)
+        LOToPO.objects.create(learning_outcome=cls.other_lo, program_outcome=cls.po1, weight=1.5)
+        LOToPO.objects.create(learning_outcome=cls.lo2, program_outcome=cls.po2, weight=1.0)
+
+        cls.student = cls.create_student('student', 'STU1')
+        cls.classmate = cls.create_student('classmate', 'STU2')
+        # The student has no final grade, so LO2 and PO2 have no score
+        AssessmentGrade.objects.create(assessment=midterm, student=cls.student, grade=80.0)
+        AssessmentGrade.objects.create(assessment=project, student=cls.student, grade=50.0)
+        AssessmentGrade.objects.create(assessment=midterm, student=cls.classmate, grade=10.0)
+        AssessmentGrade.objects.create(assessment=final, student=cls.classmate, grade=20.0)
+
+    @classmethod
+    def create_student(cls, username, student_id):
+        user = User.objects.create_user(username=username, password='student123')
+        return Student.objects.create(user=user, student_id=student_id, enrollment_date=date(2024, 9, 1))
+
+    def assert_matches_reference(self, student):
+        lo_scores, po_scores = calculate_outcome_scores(student, self.course)
+        expected_lo_scores = {}
+        for lo in (self.lo1, self.lo2, self.lo3, self.other_lo):
+            score = reference_lo_score(student, lo)
+            if score is not None:
+                expected_lo_scores[lo.id] = score
+        expected_po_scores = {}
+        for po in (self.po1, self.po2):
+            score = reference_po_score(student, po)
+            if score is not None:
+                expected_po_scores[po.id] = score
+
+        # LOs of other courses only appear when a PO of this course uses them
+        self.assertEqual(lo_scores.keys(), expected_lo_scores.keys())
+        for lo_id, score in expected_lo_scores.items():
+            self.assertAlmostEqual(lo_scores[lo_id], score)
+        self.assertEqual(po_scores.keys(), expected_po_scores.keys())
+        for po_id, score in expected_po_scores.items():
+            self.assertAlmostEqual(po_scores[po_id], score)
+        return lo_scores, po_scores
+
+    def test_matches_reference_formula(self):
+        lo_scores, po_scores = self.assert_matches_reference(self.student)
+        self.assertAlmostEqual(lo_scores[self.lo1.id], 80.0)
+        self.assertAlmostEqual(lo_scores[self.other_lo.id], 50.0)
+        self.assertNotIn(self.lo2.id, lo_scores)
+        self.assertAlmostEqual(po_scores[self.po1.id], (80.0 * 0.5 + 50.0 * 1.5) / 2.0)
+        self.assertNotIn(self.po2.id, po_scores)
+
+    def test_ignores_other_students_grades(self):
+        lo_scores, po_scores = self.assert_matches_reference(self.classmate)
+        self.assertAlmostEqual(lo_scores[self.lo1.id], 10.0 * 0.4 + 20.0 * 0.6)
+        self.assertAlmostEqual(lo_scores[self.lo2.id], 20.0)
+        self.assertAlmostEqual(po_scores[self.po1.id], lo_scores[self.lo1.id])
+
+    def test_uses_two_queries(self):
+        with self.assertNumQueries(2):
+            calculate_outcome_scores(self.student, self.course)
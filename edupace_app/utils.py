@@ -2,9 +2,13 @@ from django.core.exceptions import PermissionDenied
 from django.shortcuts import redirect
 from django.contrib import messages
 from functools import wraps
-from django.db.models import Q, Sum, Avg
+from django.db.models import F, Q, Sum, Avg
 from django.db import connection, transaction
-from .models import Teacher, Student, AcademicBoard, AssessmentGrade, AssessmentToLO, LOToPO
+from .models import Teacher, Student, AcademicBoard, Grade, AssessmentGrade, AssessmentToLO, LOToPO
+
+
+# Grade letters accepted by the Excel import
+VALID_GRADES = frozenset(value for value, _ in Grade.GRADE_CHOICES)
 
 
 def get_user_role(user):
@@ -148,84 +152,171 @@ def excel_to_pdf(excel_file_path, output_pdf_path):
         return False
 
 
+def _read_sheet_rows(excel_file):
+    """
+    Yield the rows of the first sheet of an uploaded Excel file as tuples,
+    header row first.
+    
+    .xlsx files are read with openpyxl in read-only mode so rows are streamed
+    rather than loaded into memory at once. Legacy .xls files are read with
+    xlrd, which is only imported when such a file is uploaded.
+    """
+    if excel_file.name.lower().endswith('.xls'):
+        import xlrd
+        
+        sheet = xlrd.open_workbook(file_contents=excel_file.read()).sheet_by_index(0)
+        for index in range(sheet.nrows):
+            # xlrd reports empty cells as '' and every number as a float
+            yield tuple(
+                None if value == '' else
+                int(value) if isinstance(value, float) and value.is_integer() else
+                value
+                for value in sheet.row_values(index)
+            )
+        return
+    
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_excel_header(excel_file):
+    """
+    Return the header row of an uploaded Excel sheet as a tuple without
+    reading the rest of the sheet. The file is rewound afterwards so it can
+    be processed again.
+    """
+    rows = _read_sheet_rows(excel_file)
+    try:
+        return next(rows, ())
+    finally:
+        rows.close()
+        excel_file.seek(0)
+
+
+def map_grade_columns(header):
+    """
+    Map common column names (case-insensitive) of a grade sheet header.
+    Returns (student_id_col, grade_col, percentage_col); a column that is
+    not present is returned as None.
+    """
+    student_id_col = None
+    grade_col = None
+    percentage_col = None
+    
+    for col in header:
+        name = str(col).strip().lower()
+        if 'student' in name and 'id' in name:
+            student_id_col = col
+        elif 'grade' in name:
+            grade_col = col
+        elif 'percentage' in name or 'percent' in name:
+            percentage_col = col
+    
+    return student_id_col, grade_col, percentage_col
+
+
+def iter_excel_rows(excel_file, chunksize=5000):
+    """
+    Yield the data rows of an uploaded Excel sheet in lists of at most
+    ``chunksize`` (row_number, row) pairs, where row maps each header to its
+    cell value and row_number is the row's position in the sheet.
+    
+    Only one chunk is held in memory at a time. Blank rows are skipped.
+    """
+    rows = _read_sheet_rows(excel_file)
+    header = next(rows, ())
+    chunk = []
+    
+    for row_number, row in enumerate(rows, start=2):
+        if all(cell is None for cell in row):
+            continue
+        chunk.append((row_number, dict(zip(header, row))))
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    
+    if chunk:
+        yield chunk
+
+
 def process_excel_grades(excel_file, course, assessment_type='final', semester='', academic_year='', created_by=None):
     """
     Process Excel file and create Grade objects
     Expected Excel format:
     - First row: headers (Student ID, Grade, Percentage)
     - Subsequent rows: data
+    
+    The sheet is processed in chunks (see iter_excel_rows), with the
+    students of each chunk fetched in a single query.
     """
     try:
-        import pandas as pd
         from .models import Student, Grade
         
-        # Read Excel file
-        df = pd.read_excel(excel_file)
-        
-        # Expected columns (case-insensitive)
-        df.columns = df.columns.str.strip().str.lower()
-        
-        # Map common column names
         student_id_col = None
         grade_col = None
         percentage_col = None
         
-        for col in df.columns:
-            if 'student' in col and 'id' in col:
-                student_id_col = col
-            elif 'grade' in col:
-                grade_col = col
-            elif 'percentage' in col or 'percent' in col:
-                percentage_col = col
-        
-        if not student_id_col or not grade_col:
-            return False, "Excel file must contain 'Student ID' and 'Grade' columns"
-        
         grades_created = 0
         errors = []
         
-        for index, row in df.iterrows():
-            try:
-                student_id = str(row[student_id_col]).strip()
-                grade_value = str(row[grade_col]).strip().upper()
-                percentage = None
-                
-                if percentage_col and pd.notna(row.get(percentage_col)):
-                    percentage = float(row[percentage_col])
+        for chunk in iter_excel_rows(excel_file):
+            if student_id_col is None:
+                student_id_col, grade_col, percentage_col = map_grade_columns(chunk[0][1])
                 
-                # Get student
+                if not student_id_col or not grade_col:
+                    return False, "Excel file must contain 'Student ID' and 'Grade' columns"
+            
+            # Resolve every student referenced by this chunk in one query
+            students = Student.objects.in_bulk(
+                {str(row.get(student_id_col)).strip() for _, row in chunk},
+                field_name='student_id'
+            )
+            
+            for row_number, row in chunk:
                 try:
-                    student = Student.objects.get(student_id=student_id)
-                except Student.DoesNotExist:
-                    errors.append(f"Student with ID {student_id} not found (row {index + 2})")
-                    continue
-                
-                # Validate grade
-                valid_grades = [choice[0] for choice in Grade.GRADE_CHOICES]
-                if grade_value not in valid_grades:
-                    errors.append(f"Invalid grade '{grade_value}' for student {student_id} (row {index + 2})")
-                    continue
-                
-                # Create or update grade
-                grade, created = Grade.objects.update_or_create(
-                    student=student,
-                    course=course,
-                    assessment_type=assessment_type,
-                    semester=semester,
-                    academic_year=academic_year,
-                    defaults={
-                        'grade': grade_value,
-                        'percentage': percentage,
-                        'created_by': created_by,
-                    }
-                )
-                
-                if created:
-                    grades_created += 1
+                    student_id = str(row.get(student_id_col)).strip()
+                    grade_value = str(row.get(grade_col)).strip().upper()
+                    percentage = None
+                    
+                    if percentage_col and row.get(percentage_col) is not None:
+                        percentage = float(row[percentage_col])
                     
-            except Exception as e:
-                errors.append(f"Error processing row {index + 2}: {str(e)}")
-                continue
+                    # Get student
+                    student = students.get(student_id)
+                    if student is None:
+                        errors.append(f"Student with ID {student_id} not found (row {row_number})")
+                        continue
+                    
+                    # Validate grade
+                    if grade_value not in VALID_GRADES:
+                        errors.append(f"Invalid grade '{grade_value}' for student {student_id} (row {row_number})")
+                        continue
+                    
+                    # Create or update grade
+                    grade, created = Grade.objects.update_or_create(
+                        student=student,
+                        course=course,
+                        assessment_type=assessment_type,
+                        semester=semester,
+                        academic_year=academic_year,
+                        defaults={
+                            'grade': grade_value,
+                            'percentage': percentage,
+                            'created_by': created_by,
+                        }
+                    )
+                    
+                    if created:
+                        grades_created += 1
+                        
+                except Exception as e:
+                    errors.append(f"Error processing row {row_number}: {str(e)}")
+                    continue
         
         message = f"Successfully created/updated {grades_created} grade(s)."
         if errors:
@@ -237,76 +328,64 @@ def process_excel_grades(excel_file, course, assessment_type='final', semester='
         return False, f"Error processing Excel file: {str(e)}", []
 
 
-def calculate_lo_score(student, learning_outcome):
+def calculate_outcome_scores(student, course):
     """
-    Calculate Learning Outcome score for a student.
-    Traverses AssessmentToLO edges with weights.
-    
-    Formula: LO_score = Σ(AssessmentGrade × weight) / Σ(weights)
-    """
-    # Get all assessment connections for this learning outcome
-    connections = AssessmentToLO.objects.filter(learning_outcome=learning_outcome)
-    
-    if not connections.exists():
-        return None
-    
-    total_weighted_score = 0.0
-    total_weight = 0.0
+    Calculate a student's LO and PO scores for every outcome of a course.
     
-    for connection in connections:
-        # Get the student's grade for this assessment
-        try:
-            assessment_grade = AssessmentGrade.objects.get(
-                assessment=connection.assessment,
-                student=student
-            )
-            grade_value = assessment_grade.grade
-            weight = connection.weight
-            
-            total_weighted_score += grade_value * weight
-            total_weight += weight
-        except AssessmentGrade.DoesNotExist:
-            # Student doesn't have a grade for this assessment, skip it
-            continue
+    Formulas:
+        LO_score = Σ(AssessmentGrade × weight) / Σ(weights), over the
+        AssessmentToLO edges for which the student has a grade
+        PO_score = Σ(LO_score × weight) / Σ(weights), over the LOToPO
+        edges whose learning outcome has a score
     
-    if total_weight == 0:
-        return None
+    The LO weighted sums are computed by the database in one aggregate
+    query; PO scores are then combined from those LO scores. A PO includes
+    every learning outcome connected to it, also those of other courses.
     
-    return total_weighted_score / total_weight
-
-
-def calculate_po_score(student, program_outcome):
-    """
-    Calculate Program Outcome score for a student.
-    Traverses LOToPO edges with weights.
-    
-    Formula: PO_score = Σ(LO_score × weight) / Σ(weights)
+    Returns:
+        (lo_scores, po_scores): dicts mapping learning outcome / program
+        outcome ids to scores. Outcomes without a score are left out.
     """
-    # Get all LO connections for this program outcome
-    connections = LOToPO.objects.filter(program_outcome=program_outcome)
-    
-    if not connections.exists():
-        return None
-    
-    total_weighted_score = 0.0
-    total_weight = 0.0
-    
-    for connection in connections:
-        # Calculate the LO score for this student
-        lo_score = calculate_lo_score(student, connection.learning_outcome)
-        
-        if lo_score is not None:
-            weight = connection.weight
-            total_weighted_score += lo_score * weight
-            total_weight += weight
+    # All LO → PO edges of the program outcomes this course feeds into
+    po_edges = list(LOToPO.objects.filter(
+        program_outcome__in=LOToPO.objects.filter(
+            learning_outcome__course=course
+        ).values('program_outcome')
+    ).order_by().values_list('program_outcome_id', 'learning_outcome_id', 'weight'))
+    
+    # LO_score = Σ(AssessmentGrade × weight) / Σ(weights), over the
+    # connections for which the student has a grade
+    lo_sums = AssessmentToLO.objects.filter(
+        Q(learning_outcome__course=course) |
+        Q(learning_outcome__in={lo_id for _, lo_id, _ in po_edges}),
+        assessment__grades__student=student
+    ).order_by().values('learning_outcome_id').annotate(
+        weighted_score=Sum(F('assessment__grades__grade') * F('weight')),
+        total_weight=Sum('weight')
+    )
+    lo_scores = {
+        row['learning_outcome_id']: row['weighted_score'] / row['total_weight']
+        for row in lo_sums
+        if row['total_weight']
+    }
     
-    if total_weight == 0:
-        return None
+    # PO_score = Σ(LO_score × weight) / Σ(weights), over scored LOs
+    po_totals = {}
+    for po_id, lo_id, weight in po_edges:
+        if lo_id in lo_scores:
+            totals = po_totals.setdefault(po_id, [0.0, 0.0])
+            totals[0] += lo_scores[lo_id] * weight
+            totals[1] += weight
+    po_scores = {
+        po_id: weighted_score / total_weight
+        for po_id, (weighted_score, total_weight) in po_totals.items()
+        if total_weight
+    }
     
-    return total_weighted_score / total_weight
+    return lo_scores, po_scores
 
 
-def get_course_graph_data(course, student=None):
+def get_course_graph_data(course, student=None, scores=None):
     """
     Get graph data for a course visualization.
     Returns nodes and edges for the graph.
@@ -314,6 +393,8 @@ def get_course_graph_data(course, student=None):
     Args:
         course: Course object
         student: Optional Student object to include scores in the graph
+        scores: Optional (lo_scores, po_scores) already returned by
+            calculate_outcome_scores(student, course); computed if omitted
     
     Returns:
         dict with 'nodes' and 'edges' lists
@@ -321,6 +402,11 @@ def get_course_graph_data(course, student=None):
     nodes = []
     edges = []
     
+    if student:
+        if scores is None:
+            scores = calculate_outcome_scores(student, course)
+        lo_scores, po_scores = scores
+    
     # Add assessment nodes (green diamonds)
     assessments = course.assessments.all()
     for idx, assessment in enumerate(assessments):
@@ -360,7 +446,7 @@ def get_course_graph_data(course, student=None):
         
         # Calculate and add LO score if student provided
         if student:
-            lo_score = calculate_lo_score(student, lo)
+            lo_score = lo_scores.get(lo.id)
             if lo_score is not None:
                 node_data['data']['score'] = lo_score
                 node_data['label'] = f"{lo.code}\n{lo_score:.1f}%"
@@ -387,7 +473,7 @@ def get_course_graph_data(course, student=None):
         
         # Calculate and add PO score if student provided
         if student:
-            po_score = calculate_po_score(student, po)
+            po_score = po_scores.get(po.id)
             if po_score is not None:
                 node_data['data']['score'] = po_score
                 node_data['label'] = f"{po.code}\n{po_score:.1f}%"
@@ -7,6 +7,7 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView, D
 from django.urls import reverse_lazy
 from django.http import HttpResponse, JsonResponse, FileResponse
 from django.core.exceptions import PermissionDenied
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.utils.safestring import mark_safe
 from django import forms
@@ -29,7 +30,7 @@ from .utils import (
     get_user_role, get_user_profile, role_required,
     check_course_edit_permission, check_learning_outcome_permission,
     check_grade_permission, excel_to_pdf, process_excel_grades,
-    get_course_graph_data, calculate_lo_score, calculate_po_score
+    get_course_graph_data, calculate_outcome_scores
 )
 
 
@@ -115,16 +116,20 @@ def student_course_detail(request, course_id):
     
     grade = Grade.objects.filter(student=student, course=course).first()
     
+    # Calculate LO and PO scores once, for the graph and for display
+    lo_score_map, po_score_map = calculate_outcome_scores(student, course)
+    
     # Get graph data with student scores
-    graph_data = get_course_graph_data(course, student=student)
+    graph_data = get_course_graph_data(
+        course, student=student, scores=(lo_score_map, po_score_map)
+    )
     graph_data_json = mark_safe(json.dumps(graph_data))
     
-    # Calculate LO and PO scores for display
     learning_outcomes = course.learning_outcomes.all()
     lo_scores = {}
     lo_scores_list = []
     for lo in learning_outcomes:
-        score = calculate_lo_score(student, lo)
+        score = lo_score_map.get(lo.id)
         if score is not None:
             lo_scores[lo.id] = score
             lo_scores_list.append({'lo': lo, 'score': score})
@@ -139,7 +144,7 @@ def student_course_detail(request, course_id):
     po_scores = {}
     po_scores_list = []
     for po_id, po in pos.items():
-        score = calculate_po_score(student, po)
+        score = po_score_map.get(po_id)
         if score is not None:
             po_scores[po_id] = score
             po_scores_list.append({'po': po, 'score': score})
@@ -355,7 +360,7 @@ def add_grade(request, course_id):
     else:
         form = GradeForm(teacher=teacher, initial={'course': course})
         # Filter students to only those enrolled in this course (use reverse relation)
-        form.fields['student'].queryset = course.students.all()
+        form.fields['student'].queryset = course.students.select_related('user')
         # Hide course field since it's already set
         form.fields['course'].widget = forms.HiddenInput()
     
@@ -785,14 +790,14 @@ def assign_teacher_to_course(request, course_id):
         return redirect('edupace_app:academic_board_course_detail', course_id=course_id)
     
     if request.method == 'POST':
-        form = AssignTeacherToCourseForm(request.POST)
+        form = AssignTeacherToCourseForm(request.POST, course=course)
         if form.is_valid():
             teacher = form.cleaned_data['teacher']
             course.teachers.add(teacher)
             messages.success(request, f'Teacher {teacher.user.get_full_name()} assigned to course.')
             return redirect('edupace_app:academic_board_course_detail', course_id=course_id)
     else:
-        form = AssignTeacherToCourseForm()
+        form = AssignTeacherToCourseForm(course=course)
     
     context = {
         'form': form,
@@ -808,25 +813,31 @@ def create_student(request):
     if request.method == 'POST':
         form = CreateStudentForm(request.POST)
         if form.is_valid():
-            # Create User
-            user = User.objects.create_user(
-                username=form.cleaned_data['username'],
-                email=form.cleaned_data['email'],
-                password=form.cleaned_data['password'],
-                first_name=form.cleaned_data.get('first_name', ''),
-                last_name=form.cleaned_data.get('last_name', '')
-            )
-            
-            # Create Student profile
-            student = Student.objects.create(
-                user=user,
-                student_id=form.cleaned_data['student_id'],
-                enrollment_date=form.cleaned_data['enrollment_date'],
-                program=form.cleaned_data.get('program', '')
-            )
-            
-            messages.success(request, f'Student {student.student_id} ({user.get_full_name() or user.username}) created successfully.')
-            return redirect('edupace_app:academic_board_dashboard')
+            try:
+                # The unique username and student_id constraints reject
+                # duplicates; the user is rolled back if the profile fails
+                with transaction.atomic():
+                    # Create User
+                    user = User.objects.create_user(
+                        username=form.cleaned_data['username'],
+                        email=form.cleaned_data['email'],
+                        password=form.cleaned_data['password'],
+                        first_name=form.cleaned_data.get('first_name', ''),
+                        last_name=form.cleaned_data.get('last_name', '')
+                    )
+                    
+                    # Create Student profile
+                    student = Student.objects.create(
+                        user=user,
+                        student_id=form.cleaned_data['student_id'],
+                        enrollment_date=form.cleaned_data['enrollment_date'],
+                        program=form.cleaned_data.get('program', '')
+                    )
+            except IntegrityError:
+                form.add_duplicate_errors()
+            else:
+                messages.success(request, f'Student {student.student_id} ({user.get_full_name() or user.username}) created successfully.')
+                return redirect('edupace_app:academic_board_dashboard')
     else:
         form = CreateStudentForm()
     
@@ -840,24 +851,30 @@ def create_teacher(request):
     if request.method == 'POST':
         form = CreateTeacherForm(request.POST)
         if form.is_valid():
-            # Create User
-            user = User.objects.create_user(
-                username=form.cleaned_data['username'],
-                email=form.cleaned_data['email'],
-                password=form.cleaned_data['password'],
-                first_name=form.cleaned_data.get('first_name', ''),
-                last_name=form.cleaned_data.get('last_name', '')
-            )
-            
-            # Create Teacher profile
-            teacher = Teacher.objects.create(
-                user=user,
-                employee_id=form.cleaned_data['employee_id'],
-                department=form.cleaned_data.get('department', '')
-            )
-            
-            messages.success(request, f'Teacher {teacher.employee_id} ({user.get_full_name() or user.username}) created successfully.')
-            return redirect('edupace_app:academic_board_dashboard')
+            try:
+                # The unique username and employee_id constraints reject
+                # duplicates; the user is rolled back if the profile fails
+                with transaction.atomic():
+                    # Create User
+                    user = User.objects.create_user(
+                        username=form.cleaned_data['username'],
+                        email=form.cleaned_data['email'],
+                        password=form.cleaned_data['password'],
+                        first_name=form.cleaned_data.get('first_name', ''),
+                        last_name=form.cleaned_data.get('last_name', '')
+                    )
+                    
+                    # Create Teacher profile
+                    teacher = Teacher.objects.create(
+                        user=user,
+                        employee_id=form.cleaned_data['employee_id'],
+                        department=form.cleaned_data.get('department', '')
+                    )
+            except IntegrityError:
+                form.add_duplicate_errors()
+            else:
+                messages.success(request, f'Teacher {teacher.employee_id} ({user.get_full_name() or user.username}) created successfully.')
+                return redirect('edupace_app:academic_board_dashboard')
     else:
         form = CreateTeacherForm()
     
@@ -874,14 +891,9 @@ def enroll_student_to_course(request, course_id):
         messages.error(request, 'This course is locked. You cannot enroll students.')
         return redirect('edupace_app:academic_board_course_detail', course_id=course_id)
     
-    # Get students not already enrolled in this course
-    enrolled_student_ids = course.students.values_list('id', flat=True)
-    available_students = Student.objects.exclude(id__in=enrolled_student_ids)
-    
     if request.method == 'POST':
-        form = EnrollStudentToCourseForm(request.POST)
-        # Set queryset to only available students
-        form.fields['student'].queryset = available_students
+        # The form only offers students not already enrolled in this course
+        form = EnrollStudentToCourseForm(request.POST, course=course)
         if form.is_valid():
             student = form.cleaned_data['student']
             # Double-check student is not already enrolled
@@ -892,9 +904,7 @@ def enroll_student_to_course(request, course_id):
                 messages.success(request, f'Student {student.user.get_full_name()} enrolled in course.')
             return redirect('edupace_app:academic_board_course_detail', course_id=course_id)
     else:
-        form = EnrollStudentToCourseForm()
-        # Filter out students already enrolled in this course
-        form.fields['student'].queryset = available_students
+        form = EnrollStudentToCourseForm(course=course)
     
     context = {
         'form': form,